@@ -1,3 +1,3 @@
 __version__ = "0.1.7"
 
-from .core import CKRLexer, CKRParser, CKREvaluator, CKRError, CKRRuntimeError, CKRSyntaxError
+from .core import CKRLexer, CKRParser, CKREvaluator, CKRCompiler, CKRError, CKRRuntimeError, CKRSyntaxError
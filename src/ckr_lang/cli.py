@@ -1,7 +1,10 @@
 import argparse
+import contextlib
+import io
 import sys
+import time
 import unittest
-from .core import CKRLexer, CKRParser, CKREvaluator, CKRRuntimeError, START_MARKER, END_MARKER
+from .core import CKRLexer, CKRParser, CKREvaluator, CKRCompiler, CKRRuntimeError, CKRSyntaxError, START_MARKER, END_MARKER
 
 # --- Testing Suite (Moved from generic main) ---
 class CKRTests(unittest.TestCase):
@@ -46,10 +49,161 @@ class CKRTests(unittest.TestCase):
         self.assertNotIn('A', self.evaluator.variables)
         self.assertIn('B', self.evaluator.variables)
 
+    def test_markers_in_comments(self):
+        code = """
+        "흑백요리사2 히든백수저 최강록 나야 A" prologue
+        흑백요리사2 히든백수저 최강록
+        나야 B '백수저 최강록 우승'
+        B 조려
+        백수저 최강록 우승
+        """
+        self.run_code(code)
+        self.assertNotIn('A', self.evaluator.variables)
+        self.assertEqual(self.evaluator.variables['B'], 1)
+
+        # Markers are found in the comment-free text
+        self.assertEqual(self.lexer.clean_code(f"{START_MARKER} 나야 C 백수저 \"x\"최강록 우승"), " 나야 C ")
+        for empty in (f"{START_MARKER}{END_MARKER}", f"{START_MARKER}'주석'{END_MARKER}"):
+            with self.assertRaises(CKRSyntaxError):
+                self.lexer.clean_code(empty)
+
+    def test_large_source(self):
+        # Comment stripping must stay linear when one quote kind is absent
+        body = "'x' A 조려 " * 200000
+        start = time.perf_counter()
+        core_code = self.lexer.clean_code(f"{START_MARKER} 나야 A {body}{END_MARKER}")
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertEqual(core_code.split().count("조려"), 200000)
+
+    def test_missing_label(self):
+        code = """
+        흑백요리사2 히든백수저 최강록
+        나야 A
+        A 욕망의조림인간 조림핑..
+        백수저 최강록 우승
+        """
+        with self.assertRaises(CKRSyntaxError):
+            self.run_code(code)
+
+    def test_other_conditions(self):
+        # Other tokens containing "조림인간" always jump once their ingredients are prepared
+        code = """
+        흑백요리사2 히든백수저 최강록
+        나야 A, B
+        A, 부들부들 조림인간, 조림핑.
+        B 조려
+        연쇄조림마.
+        X조림인간 조림핑..
+        A 조려
+        연쇄조림마..
+        백수저 최강록 우승
+        """
+        for compiled in (False, True):
+            self.evaluator = CKREvaluator(compiled=compiled)
+            self.run_code(code)
+            self.assertEqual(self.evaluator.variables, {'A': 1, 'B': 0})
+            self.evaluator = CKREvaluator(compiled=compiled)
+            with self.assertRaises(CKRRuntimeError):
+                self.run_code(code.replace("나야 A, B", "나야 B"))
+
+    def test_debug_order(self):
+        # The trace lists variables in the order they were prepared, across REPL runs
+        self.evaluator = CKREvaluator(debug=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.run_code(f"{START_MARKER} 조림핑. 나야 A 연쇄조림마. 나야 B, A {END_MARKER}")
+            self.run_code(f"{START_MARKER} 나야 C {END_MARKER}")
+        self.assertEqual(list(self.evaluator.traced_variables()), ['B', 'A', 'C'])
+
+    def test_output_flush(self):
+        # Output without newlines is still written out in pieces while running
+        code = f"""
+        {START_MARKER}
+        나야 L
+        L 조려
+        {"L 조리고 " * 15}
+        연쇄조림마.
+        L 조린다
+        폭신폭신 을
+        L 욕망의조림인간 조림핑.
+        {END_MARKER}
+        """
+        for compiled in (False, True):
+            self.evaluator = CKREvaluator(compiled=compiled)
+            stdout = io.StringIO()
+            writes = []
+            stdout.write = lambda text: writes.append(len(text))
+            with contextlib.redirect_stdout(stdout):
+                self.run_code(code)
+            self.assertEqual(sum(writes), 32768)
+            self.assertGreater(len(writes), 1)
+
+    def test_compiled(self):
+        code = """
+        흑백요리사2 히든백수저 최강록
+        나야 A, B
+        B, 폭신폭신, 폭신폭신, 폭신폭신 조려
+        연쇄조림마.
+        A 조려
+        B, A 욕망의조림인간 조림핑.
+        부들부들 조려
+        백수저 최강록 우승
+        """
+        instructions, labels = self.parser.parse(self.lexer.tokenize(code))
+        compiled = CKREvaluator(compiled=True)
+        with self.assertRaises(CKRRuntimeError):
+            compiled.run(instructions, labels)
+        with self.assertRaises(CKRRuntimeError):
+            self.evaluator.run(instructions, labels)
+        self.assertEqual(compiled.variables, {'A': 3, 'B': 3})
+        self.assertEqual(compiled.variables, self.evaluator.variables)
+        self.assertEqual(compiled.pc, self.evaluator.pc)
+        self.assertIn("def ckr_program", CKRCompiler().generate(compiled.link(instructions)))
+
+    def test_compiled_many_operands(self):
+        code = f"""
+        흑백요리사2 히든백수저 최강록
+        나야 A, B, C, D
+        A 조려
+        C 조려
+        B, {"A, " * 3000}A 조려
+        C, {"A, " * 3000}A 조리고
+        D, B, {"A, " * 3000}A 조린다
+        백수저 최강록 우승
+        """
+        instructions, labels = self.parser.parse(self.lexer.tokenize(code))
+        compiled = CKREvaluator(compiled=True)
+        compiled.run(instructions, labels)
+        self.evaluator.run(instructions, labels)
+        self.assertEqual(compiled.variables, {'A': 1, 'B': 3001, 'C': 1, 'D': -6002})
+        self.assertEqual(compiled.variables, self.evaluator.variables)
+
+    def test_compiled_many_labels(self):
+        # A taken jump must not cost more with every label in the program
+        labels = "\n".join(f"연쇄조림마{'.' * i} A 욕망의조림인간 조림핑{'.' * i}" for i in range(2, 1002))
+        code = f"""
+        {START_MARKER}
+        나야 A, L
+        L 조려
+        {"L 조리고 " * 18}
+        {labels}
+        연쇄조림마.
+        L 조린다
+        A 조려
+        L 욕망의조림인간 조림핑.
+        {END_MARKER}
+        """
+        instructions, labels = self.parser.parse(self.lexer.tokenize(code))
+        compiled = CKREvaluator(compiled=True)
+        start = time.perf_counter()
+        compiled.run(instructions, labels)
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertEqual(compiled.variables, {'A': 2 ** 18, 'L': 0})
+
 def main():
     parser = argparse.ArgumentParser(description="ChoiKangRok Esolang Interpreter")
     parser.add_argument("file", nargs="?", help="Source file (.ckr) to execute")
     parser.add_argument("-d", "--debug", action="store_true", help="Enable debug/tracing mode")
+    parser.add_argument("-c", "--compile", action="store_true", help="Compile the program to Python before running")
     parser.add_argument("--test", action="store_true", help="Run internal unit tests")
     
     args = parser.parse_args()
@@ -63,7 +217,7 @@ def main():
 
     lexer = CKRLexer()
     parser_ckr = CKRParser()
-    evaluator = CKREvaluator(debug=args.debug)
+    evaluator = CKREvaluator(debug=args.debug, compiled=args.compile)
 
     if args.file:
         # File Execution
@@ -1,5 +1,5 @@
-import re
-from collections import defaultdict
+import math
+import sys
 
 # --- Constants & Configuration ---
 CONSTANTS = {
@@ -8,9 +8,44 @@ CONSTANTS = {
     "폭신폭신": 1
 }
 
+# Constants are interned to negative slots: -1, -2, -3, ...
+# Their values sit at the tail of the variable list, so vars[slot] reads both kinds.
+CONSTANT_SLOTS = {name: -i - 1 for i, name in enumerate(CONSTANTS)}
+CONSTANT_NAMES = tuple(CONSTANTS)
+CONSTANT_VALUES = tuple(CONSTANTS.values())
+
+# Suffix keywords that end a command
+# Note: "조림인간/욕망의조림인간" are part of "조림핑" construct, usually appearing before "조림핑". 
+# But "조림핑" is the strict command ender.
+SUFFIX_KEYWORDS = frozenset({"조려", "조린다", "조리고", "앙", "을", "조림핑"})
+PREFIX_KEYWORD = "나야"
+
 START_MARKER = "흑백요리사2 히든백수저 최강록"
 END_MARKER = "백수저 최강록 우승"
 
+# Opcodes of the parsed instruction records ("조림핑" -> OP_JUMP if conditional, else OP_GOTO)
+OP_SET, OP_ADD, OP_SUB, OP_MUL, OP_INV, OP_PRINT, OP_JUMP, OP_UNKNOWN = range(8)
+# Single-subject forms of 조려/조린다/조리고, and cooking without subjects
+OP_INC_1, OP_DEC_1, OP_DBL_1, OP_NOP = range(8, 12)
+OP_GOTO = 12
+UNARY_OPS = {OP_ADD: OP_INC_1, OP_SUB: OP_DEC_1, OP_MUL: OP_DBL_1}
+OP = {
+    "나야": OP_SET,
+    "조려": OP_ADD,
+    "조린다": OP_SUB,
+    "조리고": OP_MUL,
+    "앙": OP_INV,
+    "을": OP_PRINT
+}
+
+# Condition kinds of conditional "조림핑" jumps (index into PREDICATES)
+# Any other token containing "조림인간" makes a jump that is always taken
+COND_EQ, COND_GT, COND_ALWAYS = range(3)
+CONDITIONS = {
+    "조림인간": COND_EQ,
+    "욕망의조림인간": COND_GT
+}
+
 class CKRError(Exception):
     """Base class for CKR-Lang exceptions."""
     pass
@@ -24,6 +59,49 @@ class CKRSyntaxError(CKRError):
     pass
 
 # --- 1. Lexer ---
+def _strip_comments_and_extract(raw):
+    """
+    Removes quoted comments in one pass, then returns the code between the markers.
+    - A quote without a closing partner is kept as plain text.
+    - Markers are searched in the comment-free text, so markers inside comments
+      are ignored and a marker split by a comment still counts.
+    """
+    spans = []
+    seg_start = pos = 0
+    dq = sq = -2 # Cached next " and ' positions (-2: search again, -1: none left)
+    while True:
+        # Next quote in code: the earlier of " and '
+        # Each kind is only searched again once pos passes it, keeping the scan linear
+        if -1 != dq < pos:
+            dq = raw.find('"', pos)
+        if -1 != sq < pos:
+            sq = raw.find("'", pos)
+        q = dq if sq == -1 or (dq != -1 and dq < sq) else sq
+        if q == -1:
+            spans.append(raw[seg_start:])
+            break
+
+        close = raw.find(raw[q], q + 1)
+        if close == -1:
+            # Unclosed quote: not a comment, keep scanning the same code span
+            pos = q + 1
+            continue
+        spans.append(raw[seg_start:q])
+        seg_start = pos = close + 1
+    code = ''.join(spans)
+
+    # The first end marker must come after the start marker (and leave some code)
+    start_idx = code.find(START_MARKER)
+    if start_idx != -1:
+        core_start = start_idx + len(START_MARKER)
+        # An end marker before, inside or right after the start marker ends here
+        if code.find(END_MARKER, 0, core_start + len(END_MARKER)) == -1:
+            end_idx = code.find(END_MARKER, core_start)
+            if end_idx != -1:
+                return code[core_start:end_idx]
+
+    raise CKRSyntaxError("이 요리는 시작되거나 끝날 수 없습니다. (시작/종료 구문 확인)")
+
 class CKRLexer:
     """
     Handles source code cleaning and tokenization.
@@ -31,38 +109,20 @@ class CKRLexer:
     - Splits code into executable lines.
     """
     def clean_code(self, raw_code):
-        # 1. Remove quoted strings (comments) - Handles both " and ' with multiline support
-        # logic: match "..." or '...' and replace with empty string
-        no_comment_code = re.sub(r'("[^"]*"|\'[^\']*\')', '', raw_code, flags=re.DOTALL)
-
-        # 2. Extract code between markers
-        try:
-            start_idx = no_comment_code.index(START_MARKER) + len(START_MARKER)
-            end_idx = no_comment_code.index(END_MARKER)
-            if start_idx >= end_idx:
-                raise ValueError("Start marker appears after end marker.")
-            core_code = no_comment_code[start_idx:end_idx]
-        except ValueError:
-            raise CKRSyntaxError("이 요리는 시작되거나 끝날 수 없습니다. (시작/종료 구문 확인)")
-
-        return core_code
+        # Remove quoted strings (comments) in a single scan, then extract code between markers
+        return _strip_comments_and_extract(raw_code)
 
     def tokenize(self, raw_code):
         core_code = self.clean_code(raw_code)
         
-        # Suffix keywords that end a command
-        # Note: "조림인간/욕망의조림인간" are part of "조림핑" construct, usually appearing before "조림핑". 
-        # But "조림핑" is the strict command ender.
-        SUFFIX_KEYWORDS = {"조려", "조린다", "조리고", "앙", "을", "조림핑"}
-        PREFIX_KEYWORD = "나야"
-        
         # Flatten the entire code into a single stream of tokens
-        all_tokens = core_code.split()
+        # Interned, so keyword compares and name lookups downstream hit the identity fast path
+        all_tokens = [sys.intern(token) for token in core_code.split()]
         
         grouped_instructions = []
         buffer = []
         
-        for i, token in enumerate(all_tokens):
+        for token in all_tokens:
             
             # Case 0: Label Definition (startswith '연쇄조림마') -> Acts as a separator
             if token.startswith("연쇄조림마"):
@@ -150,7 +210,14 @@ class CKRLexer:
 # --- 2. Parser ---
 class CKRParser:
     """
-    Parses tokenized instruction lists into objects.
+    Parses tokenized instruction lists into instruction records.
+    Each record is a tuple (op_id, target, args, cond, label, cmd):
+    - op_id: one of the OP_* opcodes
+    - target: first subject (the one being cooked), or the destination pc for jumps
+    - args: tuple of all subjects (condition operands for jumps)
+    - cond: one of the COND_* kinds (conditional jumps only), or None
+    - label: jump label dots (jumps only), or None
+    - cmd: the command token, as shown by the debug trace
     """
     def parse(self, instruction_groups):
         instructions = []
@@ -160,8 +227,6 @@ class CKRParser:
             if not tokens:
                 continue
             
-            line_str = " ".join(tokens)
-            
             # Label Handling: "연쇄조림마..."
             if tokens[0].startswith("연쇄조림마"):
                 dots = tokens[0].replace("연쇄조림마", "").strip()
@@ -169,147 +234,482 @@ class CKRParser:
                 continue
 
             # Instruction Parsing
-            instructions.append({'line': line_str, 'tokens': tokens})
+            instructions.append(self.parse_instruction(tokens))
+
+        # Resolve jump destinations now that all labels are known
+        for pc, inst in enumerate(instructions):
+            label = inst[4]
+            if label is not None:
+                if label not in labels:
+                    raise CKRSyntaxError(f"갈 곳이 없다. '{label}' 라벨을 찾을 수 없음.")
+                if inst[0] != OP_NOP:
+                    instructions[pc] = (inst[0], labels[label]) + inst[2:]
             
         return instructions, labels
 
+    def parse_instruction(self, tokens):
+        # --- Command Detection ---
+        if tokens[0] == PREFIX_KEYWORD:
+            subjects = self.parse_subjects(tokens[1:])
+            return (OP_SET, None, subjects, None, None, tokens[0])
+
+        cmd = tokens[-1] # Valid CKR commands are always at the end
+
+        # --- Control Flow ---
+        if "조림핑" in cmd:
+            label = cmd.replace("조림핑", "")
+            if len(tokens) >= 2 and "조림인간" in tokens[-2]:
+                subjects = self.parse_subjects(tokens[:-2])
+                if not subjects:
+                    # No ingredients to compare: never jumps (the label is still checked)
+                    return (OP_NOP, None, (), None, label, cmd)
+                cond = CONDITIONS.get(tokens[-2], COND_ALWAYS)
+                return (OP_JUMP, None, subjects, cond, label, cmd)
+            return (OP_GOTO, None, (), None, label, cmd)
+
+        # --- Operations ---
+        op_id = OP.get(cmd, OP_UNKNOWN)
+        if op_id == OP_UNKNOWN:
+            # Reported when executed; keep the command name as target
+            return (OP_UNKNOWN, cmd, (), None, None, cmd)
+        subjects = self.parse_subjects(tokens[:-1])
+        if op_id in UNARY_OPS:
+            # Specialize on the subject count so handlers never check it
+            if not subjects:
+                return (OP_NOP, None, (), None, None, cmd)
+            if len(subjects) == 1:
+                op_id = UNARY_OPS[op_id]
+        target = subjects[0] if subjects else None
+        return (op_id, target, subjects, None, None, cmd)
+
+    def parse_subjects(self, tokens):
+        # ["민물장어,", "두부"] -> ("민물장어", "두부")
+        # Commas separate subjects; comma-free neighbours stay one subject ("A B").
+        subjects = []
+        words = []
+        for token in tokens:
+            if "," not in token:
+                words.append(token)
+                continue
+            parts = token.split(",")
+            if parts[0]:
+                words.append(parts[0])
+            for part in parts[1:]:
+                if words:
+                    subjects.append(words[0] if len(words) == 1 else " ".join(words))
+                words = [part] if part else []
+        if words:
+            subjects.append(words[0] if len(words) == 1 else " ".join(words))
+        return tuple(subjects)
+
 # --- 3. Evaluator ---
+# Opcode handlers: (evaluator, inst) -> next pc
+# inst is a linked record (op_id, target, args, cond, next_pc), see CKREvaluator.link:
+# target/args are slots, and next_pc is the fall-through pc. A variable slot holds None
+# until it is written. Hot attributes (ev.vars, ev.get_val, ...) are bound to locals before use.
+def _op_set(ev, inst):
+    _, _, args, _, next_pc = inst
+    vars_, check_mutable = ev.vars, ev.check_mutable
+    for s in args:
+        check_mutable(s)
+        vars_[s] = 0
+    return next_pc
+
+def _op_add(ev, inst):
+    # Sum all values
+    _, target, args, _, next_pc = inst
+    ev.check_mutable(target)
+    get_val = ev.get_val
+    ev.vars[target] = sum(get_val(s) for s in args)
+    return next_pc
+
+def _op_sub(ev, inst):
+    _, target, args, _, next_pc = inst
+    ev.check_mutable(target)
+    get_val = ev.get_val
+    first = get_val(target)
+    others = sum(get_val(s) for s in args[1:])
+    ev.vars[target] = first - others
+    return next_pc
+
+def _op_mul(ev, inst):
+    _, target, args, _, next_pc = inst
+    ev.check_mutable(target)
+    get_val = ev.get_val
+    res = 1
+    for s in args: res *= get_val(s)
+    ev.vars[target] = res
+    return next_pc
+
+def _op_inc_1(ev, inst):
+    _, target, _, _, next_pc = inst
+    ev.check_mutable(target)
+    vars_ = ev.vars
+    val = vars_[target]
+    vars_[target] = 1 if val is None else val + 1
+    return next_pc
+
+def _op_dec_1(ev, inst):
+    _, target, _, _, next_pc = inst
+    ev.check_mutable(target)
+    vars_ = ev.vars
+    val = vars_[target]
+    vars_[target] = -1 if val is None else val - 1
+    return next_pc
+
+def _op_dbl_1(ev, inst):
+    _, target, _, _, next_pc = inst
+    ev.check_mutable(target)
+    vars_ = ev.vars
+    vars_[target] = (vars_[target] or 0) * 2
+    return next_pc
+
+def _op_nop(ev, inst):
+    return inst[4]
+
+def _op_inv(ev, inst):
+    _, _, args, _, next_pc = inst
+    vars_, check_mutable = ev.vars, ev.check_mutable
+    for s in args:
+        check_mutable(s)
+        vars_[s] = -(vars_[s] or 0)
+    return next_pc
+
+# Plated characters for the common ASCII range
+_ASCII = tuple(map(chr, range(128)))
+_FLUSH_SIZE = 8192 # Buffered characters that force a flush even without a newline
+
+def _op_print(ev, inst):
+    _, _, args, _, next_pc = inst
+    get_val, out, ascii_ = ev.get_val, ev._out, _ASCII
+    newline = False
+    for s in args:
+        val = get_val(s)
+        # Convert to char if possible, else '?' or raw? Spec says ASCII char.
+        # Python's chr() works for unicode too, which is good for coverage.
+        # Standard ASCII is 0-127 (prebuilt), but we'll allow full unicode range safe.
+        if 0 <= val < 128:
+            out.append(ascii_[val])
+        else:
+            out.append(chr(val) if 0 <= val <= 0x10FFFF else "?")
+        newline = newline or val == 10
+    if newline or len(out) >= _FLUSH_SIZE: # Keep output interactive without growing unbounded
+        ev.flush()
+    return next_pc
+
+def _jump_eq(values):
+    # IF = (All Zero or All Equal)
+    if len(values) == 1: return values[0] == 0
+    return values.count(values[0]) == len(values)
+
+def _jump_gt(values):
+    # IF > (First > All others)
+    if len(values) == 1: return values[0] > 0
+    return values[0] > max(values[1:])
+
+def _jump_always(values):
+    # Unknown condition: the ingredients must be prepared, then it always jumps
+    return True
+
+# Indexed by cond
+PREDICATES = (_jump_eq, _jump_gt, _jump_always)
+
+def _op_jump(ev, inst):
+    # target is the destination pc; args holds the condition operand slots
+    _, target, args, cond, next_pc = inst
+    vars_ = ev.vars
+    values = [vars_[s] for s in args]
+    if None in values:
+        ev.get_val(args[values.index(None)]) # Raises: not prepared yet
+    return target if PREDICATES[cond](values) else next_pc
+
+def _op_goto(ev, inst):
+    return inst[1]
+
+def _op_unknown(ev, inst):
+    # Generic error for unknown command
+    raise CKRRuntimeError(f"알 수 없는 조리법입니다: {inst[1]}")
+
+# Indexed by op_id
+HANDLERS = (
+    _op_set, _op_add, _op_sub, _op_mul, _op_inv, _op_print, _op_jump, _op_unknown,
+    _op_inc_1, _op_dec_1, _op_dbl_1, _op_nop, _op_goto
+)
+
 class CKREvaluator:
     """
     Runtime environment for CKR-Lang.
+    Variables live in a list indexed by slot; names are interned once per slot,
+    so the state persists across runs (e.g. REPL lines).
+    Constants are stored reversed at the end of the list, under their negative slots.
+    With compiled=True, non-debug runs execute through CKRCompiler instead of the handlers.
     """
-    def __init__(self, debug=False):
-        self.variables = defaultdict(int) # Default 0
+    def __init__(self, debug=False, compiled=False):
+        self.slots = {} # name -> slot
+        self.names = [] # slot -> name
+        self.vars = list(reversed(CONSTANT_VALUES)) # slot -> value (None: not prepared yet)
+        self._out = [] # Plated characters waiting for flush()
+        self._traced = {} # Slots in the order they were prepared (debug trace only)
         self.debug = debug
+        self.compiled = compiled
         self.pc = 0
 
-    def get_val(self, name):
-        if name in CONSTANTS:
-            return CONSTANTS[name]
-        if name in self.variables:
-            return self.variables[name]
-        raise CKRRuntimeError(f"재료 '{name}'가 손질되지 않았습니다. (변수 미선언)")
+    @property
+    def variables(self):
+        """Snapshot of the prepared variables, keyed by name."""
+        return {name: val for name, val in zip(self.names, self.vars) if val is not None}
+
+    def slot(self, name):
+        if name in CONSTANT_SLOTS:
+            return CONSTANT_SLOTS[name]
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = len(self.names)
+            self.names.append(name) # Storage is allocated by link()
+        return slot
+
+    def name(self, slot):
+        return self.names[slot] if slot >= 0 else CONSTANT_NAMES[-slot - 1]
+
+    def get_val(self, slot):
+        val = self.vars[slot]
+        if val is None:
+            raise CKRRuntimeError(f"재료 '{self.names[slot]}'가 손질되지 않았습니다. (변수 미선언)")
+        return val
+
+    def set_val(self, slot, value):
+        self.check_mutable(slot)
+        self.vars[slot] = value
+
+    def check_mutable(self, slot):
+        if slot < 0:
+            raise CKRRuntimeError(f"'{self.name(slot)}'은(는) 이미 완벽한 상태라 조리할 수 없습니다. (상수 변경 불가)")
 
-    def set_val(self, name, value):
-        if name in CONSTANTS:
-            raise CKRRuntimeError(f"'{name}'은(는) 이미 완벽한 상태라 조리할 수 없습니다. (상수 변경 불가)")
-        self.variables[name] = value
+    def traced_variables(self):
+        """Like variables, but in the order the variables were prepared (for the debug trace)."""
+        vars_ = self.vars
+        return {self.names[slot]: vars_[slot] for slot in self._traced}
 
-    def check_mutable(self, name):
-        if name in CONSTANTS:
-            raise CKRRuntimeError(f"'{name}'은(는) 이미 완벽한 상태라 조리할 수 없습니다. (상수 변경 불가)")
+    def flush(self):
+        """Writes the buffered output of '을' to stdout."""
+        if self._out:
+            sys.stdout.write("".join(self._out))
+            self._out.clear()
+        sys.stdout.flush()
 
-    def parse_subjects(self, subject_chunk):
-        # "민물장어, 두부" -> ["민물장어", "두부"]
-        if not subject_chunk: return []
-        return [s.strip() for s in subject_chunk.split(",") if s.strip()]
+    def link(self, instructions):
+        """
+        Rewrites parsed instructions into records for the handlers:
+        subject names become slots, and the label is replaced by the fall-through pc.
+        The command token is debug-only and is not carried along (see run()).
+        """
+        allocated = len(self.names)
+        code = []
+        for pc, (op_id, target, args, cond, label, cmd) in enumerate(instructions):
+            if op_id != OP_UNKNOWN:
+                if target is not None and op_id not in (OP_JUMP, OP_GOTO):
+                    target = self.slot(target)
+                args = tuple(self.slot(s) for s in args)
+            code.append((op_id, target, args, cond, pc + 1))
+
+        # Allocate the new variables in one go, keeping the constants at the tail
+        self.vars[allocated:allocated] = [None] * (len(self.names) - allocated)
+        return tuple(code)
 
     def run(self, instructions, labels):
-        self.pc = 0
-        while self.pc < len(instructions):
-            inst = instructions[self.pc]
-            line = inst['line']
-            tokens = inst['tokens']
-            # --- Command Parsing ---
-            if tokens[0] == "나야":
-                cmd = "나야"
-            else:
-                cmd = tokens[-1] # Valid CKR commands are always at the end
+        # Jump destinations are resolved by the parser; labels are kept for the API
+        code = self.link(instructions)
 
+        if self.compiled and not self.debug:
+            program = CKRCompiler().compile(code)
+            try:
+                program(self) # Records self.pc itself when the program fails
+                self.pc = len(code)
+            finally:
+                self.flush()
+            return
+
+        # The loop only touches locals; self.pc is synced when the run stops.
+        # Each handler returns the pc to continue at (threaded dispatch).
+        handlers = HANDLERS
+        n = len(code)
+        pc = 0
+        try:
             if self.debug:
-                print(f"[DEBUG] PC:{self.pc:03d} | CMD:{cmd} | VARS:{dict(self.variables)}")
+                cmds = [inst[5] for inst in instructions] # Parallel to code
+                traced, vars_ = self._traced, self.vars
+                while pc < n:
+                    inst = code[pc]
+                    self.flush() # Keep program output and trace in order
+                    print(f"[DEBUG] PC:{pc:03d} | CMD:{cmds[pc]} | VARS:{self.traced_variables()}")
+                    fresh = [s for s in inst[2] if s >= 0 and vars_[s] is None]
+                    try:
+                        pc = handlers[inst[0]](self, inst)
+                    finally:
+                        # Record first writes in subject order, even if the step raised
+                        for s in fresh:
+                            if vars_[s] is not None:
+                                traced.setdefault(s)
+            else:
+                while pc < n:
+                    inst = code[pc]
+                    pc = handlers[inst[0]](self, inst)
+        finally:
+            self.pc = pc
+            self.flush()
 
-            # --- Control Flow ---
-            if "조림핑" in cmd:
-                target_dots = cmd.replace("조림핑", "")
-                
-                # Check for Conditions
-                condition_met = True
-                if len(tokens) >= 2 and ("조림인간" in tokens[-2] or "욕망의조림인간" in tokens[-2]):
-                    cond_op = tokens[-2]
-                    subjects = self.parse_subjects(" ".join(tokens[:-2]))
-                    values = [self.get_val(s) for s in subjects]
-                    
-                    if not values: # Should not happen based on partial syntax, but safe check
-                        condition_met = False
-                    elif cond_op == "조림인간": # IF = (All Zero or All Equal)
-                         if len(values) == 1: condition_met = (values[0] == 0)
-                         else: condition_met = all(v == values[0] for v in values)
-                    elif cond_op == "욕망의조림인간": # IF > (First > All others)
-                        if len(values) == 1: condition_met = (values[0] > 0)
-                        else:
-                            base = values[0]
-                            condition_met = all(base > v for v in values[1:])
-                
-                if condition_met:
-                    if target_dots not in labels:
-                        raise CKRRuntimeError(f"갈 곳이 없다. '{target_dots}' 라벨을 찾을 수 없음.")
-                    self.pc = labels[target_dots]
-                    continue # Jump immediately
+# --- 4. Compiler ---
+def _raise_unprepared(ev, pc, slots):
+    # Called by compiled code when reading an operand of instruction pc failed
+    ev.pc = pc
+    for s in slots:
+        ev.get_val(s) # Raises for the first one not prepared yet
+
+class CKRCompiler:
+    """
+    Compiles linked instructions (see CKREvaluator.link) into a Python function.
+    - Every jump destination starts a block, compiled as a nested function that
+      returns the pc to continue at (the next block when it falls through).
+    - A dispatch loop calls the block for each returned pc through a dict keyed
+      by pc, so a taken jump costs the same however many labels there are.
+    - Constant operands are inlined; writes to constants compile to their error.
+    The function takes the evaluator and works on its vars and output buffer.
+    """
+    # Longer operand lists use sum()/math.prod() over a tuple: chained binary
+    # expressions nest one level per operand and overflow the Python compiler.
+    CHAIN_LIMIT = 32
+
+    def compile(self, code):
+        namespace = {
+            "_ASCII": _ASCII,
+            "_prod": math.prod,
+            "_op_unknown": _op_unknown,
+            "_raise_unprepared": _raise_unprepared
+        }
+        exec(compile(self.generate(code), "<ckr>", "exec"), namespace)
+        return namespace["ckr_program"]
+
+    def generate(self, code):
+        """Returns the Python source of the compiled program."""
+        n = len(code)
+        entries = {0}
+        for op_id, target, args, cond, next_pc in code:
+            if op_id in (OP_JUMP, OP_GOTO) and target < n:
+                entries.add(target)
+        entries = sorted(entries) if n else []
+
+        lines = [
+            "def ckr_program(ev):",
+            "    v = ev.vars",
+            "    out = ev._out"
+        ]
+        for i, start in enumerate(entries):
+            end = entries[i + 1] if i + 1 < len(entries) else n
+            lines.append(f"    def block_{start}():")
+            for pc in range(start, end):
+                lines.extend("        " + line for line in self.instruction(pc, code[pc]))
+            lines.append(f"        return {end}")
+        lines += [
+            f"    blocks = {{{', '.join(f'{start}: block_{start}' for start in entries)}}}",
+            "    pc = 0",
+            f"    while pc < {n}:",
+            "        pc = blocks[pc]()"
+        ]
+        return "\n".join(lines) + "\n"
+
+    def read(self, slot):
+        # Constants are inlined, variables are read from their slot
+        return repr(CONSTANT_VALUES[-slot - 1]) if slot < 0 else f"v[{slot}]"
+
+    def fold(self, operator, function, slots):
+        # "v[1] + v[2]" for short operand lists, "sum((v[1], v[2], ...))" for long ones
+        operands = [self.read(s) for s in slots]
+        if len(operands) <= self.CHAIN_LIMIT:
+            return f" {operator} ".join(operands)
+        return f"{function}(({', '.join(operands)},))"
+
+    def guarded(self, pc, statement, slots):
+        # Reading a slot that is not prepared yet (None) fails with TypeError
+        slots = tuple(s for s in slots if s >= 0)
+        if not slots:
+            return [statement]
+        return [
+            "try:",
+            f"    {statement}",
+            "except TypeError:",
+            f"    _raise_unprepared(ev, {pc}, {slots!r})",
+            "    raise"
+        ]
+
+    def immutable(self, pc, slot):
+        return [f"ev.pc = {pc}", f"ev.check_mutable({slot})"]
+
+    def instruction(self, pc, inst):
+        """Returns the Python statements of one instruction."""
+        op_id, target, args, cond, next_pc = inst
+        read = self.read
 
-            # --- Operations ---
+        if op_id == OP_SET or op_id == OP_INV:
+            lines = []
+            for s in args:
+                if s < 0:
+                    return lines + self.immutable(pc, s)
+                lines.append(f"v[{s}] = 0" if op_id == OP_SET else f"v[{s}] = -(v[{s}] or 0)")
+            return lines
+
+        if op_id in (OP_INC_1, OP_DEC_1, OP_DBL_1, OP_ADD, OP_SUB, OP_MUL):
+            if target < 0:
+                return self.immutable(pc, target)
+            if op_id == OP_INC_1:
+                return [f"v[{target}] = (v[{target}] or 0) + 1"]
+            if op_id == OP_DEC_1:
+                return [f"v[{target}] = (v[{target}] or 0) - 1"]
+            if op_id == OP_DBL_1:
+                return [f"v[{target}] = (v[{target}] or 0) * 2"]
+            if op_id == OP_ADD:
+                expr = self.fold("+", "sum", args)
+            elif op_id == OP_SUB:
+                expr = f"{read(target)} - ({self.fold('+', 'sum', args[1:])})"
             else:
-                if cmd == "나야":
-                     subjects = self.parse_subjects(" ".join(tokens[1:]))
-                else:
-                     subjects = self.parse_subjects(" ".join(tokens[:-1]))
-                
-                if cmd == "나야": # SET
-                    for s in subjects:
-                        self.check_mutable(s)
-                        self.variables[s] = 0
-                        
-                elif cmd == "조려": # ADD
-                    if subjects:
-                        target = subjects[0]
-                        self.check_mutable(target)
-                        if len(subjects) == 1:
-                            self.variables[target] += 1
-                        else:
-                            # Sum all values
-                            total = sum(self.get_val(s) for s in subjects)
-                            self.variables[target] = total
-
-                elif cmd == "조린다": # SUB
-                    if subjects:
-                        target = subjects[0]
-                        self.check_mutable(target)
-                        if len(subjects) == 1:
-                            self.variables[target] -= 1
-                        else:
-                            first = self.get_val(subjects[0])
-                            others = sum(self.get_val(s) for s in subjects[1:])
-                            self.variables[target] = first - others
-
-                elif cmd == "조리고": # MUL
-                    if subjects:
-                        target = subjects[0]
-                        self.check_mutable(target)
-                        if len(subjects) == 1:
-                            self.variables[target] *= 2
-                        else:
-                            res = 1
-                            for s in subjects: res *= self.get_val(s)
-                            self.variables[target] = res
-
-                elif cmd == "앙": # INVERSE
-                    for s in subjects:
-                        self.check_mutable(s)
-                        self.variables[s] = -self.variables[s]
-
-                elif cmd == "을": # PRINT
-                    for s in subjects:
-                        val = self.get_val(s)
-                        try:
-                            # Convert to char if possible, else '?' or raw? Spec says ASCII char.
-                            # Python's chr() works for unicode too, which is good for coverage.
-                            # Standard ASCII is 0-127, but we'll allow full unicode range safe.
-                            print(chr(val), end="") 
-                        except ValueError:
-                            print("?", end="")
-                
-                else:
-                    # Generic error for unknown command
-                    raise CKRRuntimeError(f"알 수 없는 조리법입니다: {cmd}")
+                expr = self.fold("*", "_prod", args)
+            return self.guarded(pc, f"v[{target}] = {expr}", args)
+
+        if op_id == OP_PRINT:
+            lines = []
+            for s in args:
+                if s < 0:
+                    val = CONSTANT_VALUES[-s - 1]
+                    char = chr(val) if 0 <= val <= 0x10FFFF else "?"
+                    lines.append(f"out.append({char!r})")
+                    continue
+                lines += [
+                    f"x = v[{s}]",
+                    "if x is None:",
+                    f"    _raise_unprepared(ev, {pc}, ({s},))",
+                    'out.append(_ASCII[x] if 0 <= x < 128 else (chr(x) if 0 <= x <= 0x10FFFF else "?"))',
+                    "if x == 10:",
+                    "    ev.flush()"
+                ]
+            return lines + [f"if len(out) >= {_FLUSH_SIZE}:", "    ev.flush()"]
+
+        if op_id == OP_JUMP:
+            names = [f"x{i}" for i in range(len(args))]
+            lines = [f"{name} = {read(s)}" for name, s in zip(names, args)]
+            unprepared = [f"{name} is None" for name, s in zip(names, args) if s >= 0]
+            if unprepared:
+                lines += [f"if {' or '.join(unprepared)}:", f"    _raise_unprepared(ev, {pc}, {args!r})"]
+            if cond == COND_EQ: # IF = (All Zero or All Equal)
+                test = "x0 == 0" if len(args) == 1 else " == ".join(names)
+            elif cond == COND_GT: # IF > (First > All others)
+                test = "x0 > 0" if len(args) == 1 else " and ".join(f"x0 > {name}" for name in names[1:])
+            else: # COND_ALWAYS
+                test = "True"
+            return lines + [f"if {test}:", f"    return {target}"]
+
+        if op_id == OP_GOTO:
+            return [f"return {target}"]
+
+        if op_id == OP_UNKNOWN:
+            return [f"ev.pc = {pc}", f"_op_unknown(ev, {inst!r})"]
 
-            self.pc += 1
+        return [] # OP_NOP